@@ -13,21 +13,28 @@ from langextract_azureopenai.schema import AzureOpenAISchema
 
 # Azure OpenAI Chat Completions API supported parameters
 # Based on: https://learn.microsoft.com/en-us/azure/ai-foundry/openai/reference
-_AZURE_OPENAI_CONFIG_KEYS: Final[set[str]] = {
-    'frequency_penalty',  # Number between -2.0 and 2.0
-    'presence_penalty',  # Number between -2.0 and 2.0
-    'stop',  # String or array of stop sequences
-    'logprobs',  # Whether to return log probabilities
-    'top_logprobs',  # Number of most likely tokens (0-5)
-    'seed',  # Random seed for deterministic outputs
-    'user',  # Unique identifier for end-user
-    'response_format',  # Output format (text, json_object, json_schema)
-    'tools',  # Array of tools/functions model can call (unsupported)
-    'tool_choice',  # Controls which tools to use (unsupported)
-    'logit_bias',  # Map of token IDs to bias scores (-100 to 100)
-    'stream',  # Whether to stream partial responses (unsupported)
-    'parallel_tool_calls',  # Whether to enable parallel function calling (unsupported)
-}
+_AZURE_OPENAI_CONFIG_KEYS: Final[frozenset[str]] = frozenset(
+    {
+        'frequency_penalty',  # Number between -2.0 and 2.0
+        'presence_penalty',  # Number between -2.0 and 2.0
+        'stop',  # String or array of stop sequences
+        'logprobs',  # Whether to return log probabilities
+        'top_logprobs',  # Number of most likely tokens (0-5)
+        'seed',  # Random seed for deterministic outputs
+        'user',  # Unique identifier for end-user
+        'response_format',  # Output format (text, json_object, json_schema)
+        'tools',  # Array of tools/functions model can call (unsupported)
+        'tool_choice',  # Controls which tools to use (unsupported)
+        'logit_bias',  # Map of token IDs to bias scores (-100 to 100)
+        'stream',  # Whether to stream partial responses (unsupported)
+        'parallel_tool_calls',  # Whether to enable parallel function calling (unsupported)
+    }
+)
+
+# Whitelisted keys this provider rejects until it can handle their responses
+_UNSUPPORTED_CONFIG_KEYS: Final[frozenset[str]] = frozenset(
+    {'stream', 'tools', 'tool_choice', 'parallel_tool_calls'}
+)
 
 
 @lx.providers.registry.register(r'^azureopenai', priority=10)
@@ -46,6 +53,8 @@ class AzureOpenAILanguageModel(lx.inference.BaseLanguageModel):
         deployment_name: str | None = None,
         temperature: float | None = None,
         max_workers: int = 10,
+        http_client: Any | None = None,
+        max_retries: int | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the Azure OpenAI language model.
@@ -58,6 +67,10 @@ class AzureOpenAILanguageModel(lx.inference.BaseLanguageModel):
             deployment_name: Deployment name. If None, extracted from model_id.
             temperature: Sampling temperature.
             max_workers: Maximum number of parallel API calls.
+            http_client: Optional pre-configured ``httpx.Client`` passed to
+                ``openai.AzureOpenAI`` (connection pool limits, HTTP/2, proxies).
+            max_retries: Retries the SDK makes for a failed request. None keeps
+                the SDK default; pass 0 when the caller does its own retrying.
             **kwargs: Additional parameters passed to the Azure OpenAI API.
         """
         # Lazy import: OpenAI package required
@@ -82,14 +95,7 @@ class AzureOpenAILanguageModel(lx.inference.BaseLanguageModel):
         self._enable_structured_output: bool = False
 
         # Extract deployment name from model_id if not provided
-        if deployment_name:
-            self.deployment_name = deployment_name
-        else:
-            # Extract deployment name by removing 'azureopenai-' prefix
-            if isinstance(model_id, str) and model_id.startswith('azureopenai-'):
-                self.deployment_name = model_id[len('azureopenai-') :]
-            else:
-                self.deployment_name = model_id or ''
+        self.deployment_name = deployment_name or self._derive_deployment_name(model_id)
 
         # Validate required parameters
         if not self.api_key:
@@ -109,24 +115,38 @@ class AzureOpenAILanguageModel(lx.inference.BaseLanguageModel):
             )
 
         # Reject unsupported parameters early if provided at construction
-        unsupported = {'stream', 'tools', 'tool_choice', 'parallel_tool_calls'}
-        for key in unsupported.intersection(set((kwargs or {}).keys())):
+        for key in sorted(kwargs.keys() & _UNSUPPORTED_CONFIG_KEYS):
             raise lx.exceptions.InferenceConfigError(
                 f"Unsupported parameter provided: {key}. This provider does not support it yet."
             )
 
         # Initialize the Azure OpenAI client
+        client_options: dict[str, Any] = {}
+        if max_retries is not None:
+            client_options['max_retries'] = max_retries
         self._client = AzureOpenAI(
             api_version=self.api_version,
             azure_endpoint=self.azure_endpoint,
             api_key=self.api_key,
+            http_client=http_client,
+            **client_options,
         )
 
         # Filter extra kwargs to only include valid Azure OpenAI API parameters
         self._extra_kwargs = {
-            k: v for k, v in (kwargs or {}).items() if k in _AZURE_OPENAI_CONFIG_KEYS
+            k: kwargs[k] for k in kwargs.keys() & _AZURE_OPENAI_CONFIG_KEYS
         }
 
+    @staticmethod
+    def _derive_deployment_name(model_id: str | None) -> str:
+        """Return the deployment name implied by a model ID.
+
+        Strips the 'azureopenai-' routing prefix; IDs without it are used as-is.
+        """
+        if isinstance(model_id, str) and model_id.startswith('azureopenai-'):
+            return model_id[len('azureopenai-') :]
+        return model_id or ''
+
     @classmethod
     def get_schema_class(cls) -> type[AzureOpenAISchema]:
         """Tell LangExtract about our schema support."""
@@ -147,72 +167,113 @@ class AzureOpenAILanguageModel(lx.inference.BaseLanguageModel):
                 cfg.get('enable_structured_output') or cfg.get('structured_output')
             )
 
+    def _build_request(self, prompt: str, **config: Any) -> dict[str, Any]:
+        """Build the chat.completions.create arguments for a single prompt.
+
+        Args:
+            prompt: The user prompt.
+            **config: Generation params for this call; stored constructor
+                kwargs fill in anything not set here.
+
+        Returns:
+            Keyword arguments for ``chat.completions.create``.
+        """
+        # Apply stored kwargs that weren't already set in config
+        for key, value in self._extra_kwargs.items():
+            if key not in config and value is not None:
+                config[key] = value
+
+        # Build messages. When structured output is enabled, include an
+        # explicit system instruction mentioning "json" to satisfy the
+        # API requirement for response_format={'type': 'json_object'}.
+        if self._enable_structured_output:
+            messages: list[dict[str, str]] = [
+                {
+                    'role': 'system',
+                    'content': (
+                        'You are a helpful assistant that outputs JSON. '
+                        'Return only a valid JSON object (no code fences).'
+                    ),
+                },
+                {'role': 'user', 'content': prompt},
+            ]
+        else:
+            messages = [{'role': 'user', 'content': prompt}]
+
+        api_params: dict[str, Any] = {
+            'model': self.deployment_name,
+            'messages': messages,
+        }
+
+        # Only set temperature if explicitly provided
+        temp = config.get('temperature', self.temperature)
+        if temp is not None:
+            api_params['temperature'] = temp
+
+        # Enable JSON mode when structured output is requested
+        if self._enable_structured_output:
+            api_params['response_format'] = {'type': 'json_object'}
+            # If strict JSON Schema mode is desired and supported, integrate here:
+            # if self._response_schema:
+            #     api_params['response_format'] = {
+            #         'type': 'json_schema',
+            #         'json_schema': self._response_schema,
+            #     }
+
+        # Apply standard configuration parameters
+        if (v := config.get('max_completion_tokens')) is not None:
+            api_params['max_completion_tokens'] = v
+        if (v := config.get('top_p')) is not None:
+            api_params['top_p'] = v
+
+        # Apply Azure OpenAI-specific parameters from whitelist
+        # Reject unsupported params if present
+        for key in sorted(config.keys() & _UNSUPPORTED_CONFIG_KEYS):
+            raise lx.exceptions.InferenceConfigError(
+                f"Unsupported parameter provided: {key}. This provider does not support it yet."
+            )
+        for key in config.keys() & _AZURE_OPENAI_CONFIG_KEYS:
+            if (v := config[key]) is not None:
+                api_params[key] = v
+
+        return api_params
+
+    def _build_config(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Select the generation params for a call from caller kwargs.
+
+        Raises:
+            InferenceConfigError: If an unsupported parameter is set.
+        """
+        config: dict[str, Any] = {}
+
+        # Handle standard parameters explicitly
+        temp = kwargs.get('temperature', self.temperature)
+        if temp is not None:
+            config['temperature'] = temp
+        if 'max_completion_tokens' in kwargs:
+            config['max_completion_tokens'] = kwargs['max_completion_tokens']
+        if 'top_p' in kwargs:
+            config['top_p'] = kwargs['top_p']
+
+        # Handle all other whitelisted Azure OpenAI parameters
+        handled_keys = {'temperature', 'max_completion_tokens', 'top_p'}
+        for key in (kwargs.keys() & _AZURE_OPENAI_CONFIG_KEYS) - handled_keys:
+            if (value := kwargs[key]) is not None:
+                # Reject unsupported params at runtime
+                if key in _UNSUPPORTED_CONFIG_KEYS:
+                    raise lx.exceptions.InferenceConfigError(
+                        f"Unsupported parameter provided: {key}. This provider does not support it yet."
+                    )
+                config[key] = value
+
+        return config
+
     def _process_single_prompt(
         self, prompt: str, config: dict[str, Any]
     ) -> lx.inference.ScoredOutput:
         """Process a single prompt and return a ScoredOutput."""
         try:
-            # Apply stored kwargs that weren't already set in config
-            for key, value in self._extra_kwargs.items():
-                if key not in config and value is not None:
-                    config[key] = value
-
-            # Build messages. When structured output is enabled, include an
-            # explicit system instruction mentioning "json" to satisfy the
-            # API requirement for response_format={'type': 'json_object'}.
-            if self._enable_structured_output:
-                messages: list[dict[str, str]] = [
-                    {
-                        'role': 'system',
-                        'content': (
-                            'You are a helpful assistant that outputs JSON. '
-                            'Return only a valid JSON object (no code fences).'
-                        ),
-                    },
-                    {'role': 'user', 'content': prompt},
-                ]
-            else:
-                messages = [{'role': 'user', 'content': prompt}]
-
-            api_params: dict[str, Any] = {
-                'model': self.deployment_name,
-                'messages': messages,
-            }
-
-            # Only set temperature if explicitly provided
-            temp = config.get('temperature', self.temperature)
-            if temp is not None:
-                api_params['temperature'] = temp
-
-            # Enable JSON mode when structured output is requested
-            if self._enable_structured_output:
-                api_params['response_format'] = {'type': 'json_object'}
-                # If strict JSON Schema mode is desired and supported, integrate here:
-                # if self._response_schema:
-                #     api_params['response_format'] = {
-                #         'type': 'json_schema',
-                #         'json_schema': self._response_schema,
-                #     }
-
-            # Apply standard configuration parameters
-            if (v := config.get('max_completion_tokens')) is not None:
-                api_params['max_completion_tokens'] = v
-            if (v := config.get('top_p')) is not None:
-                api_params['top_p'] = v
-
-            # Apply Azure OpenAI-specific parameters from whitelist
-            # Reject unsupported params if present
-            for key in _AZURE_OPENAI_CONFIG_KEYS:
-                if (
-                    key in {'stream', 'tools', 'tool_choice', 'parallel_tool_calls'}
-                    and key in config
-                ):
-                    raise lx.exceptions.InferenceConfigError(
-                        f"Unsupported parameter provided: {key}. This provider does not support it yet."
-                    )
-                if (v := config.get(key)) is not None:
-                    api_params[key] = v
-
+            api_params = self._build_request(prompt, **config)
             response = self._client.chat.completions.create(**api_params)
 
             # Extract the response text using the v1.x response format
@@ -237,31 +298,7 @@ class AzureOpenAILanguageModel(lx.inference.BaseLanguageModel):
         Yields:
             Lists of ScoredOutputs.
         """
-        config: dict[str, Any] = {}
-
-        # Handle standard parameters explicitly
-        temp = kwargs.get('temperature', self.temperature)
-        if temp is not None:
-            config['temperature'] = temp
-        if 'max_completion_tokens' in kwargs:
-            config['max_completion_tokens'] = kwargs['max_completion_tokens']
-        if 'top_p' in kwargs:
-            config['top_p'] = kwargs['top_p']
-
-        # Handle all other whitelisted Azure OpenAI parameters
-        handled_keys = {'temperature', 'max_completion_tokens', 'top_p'}
-        for key, value in kwargs.items():
-            if (
-                key not in handled_keys
-                and key in _AZURE_OPENAI_CONFIG_KEYS
-                and value is not None
-            ):
-                # Reject unsupported params at runtime
-                if key in {'stream', 'tools', 'tool_choice', 'parallel_tool_calls'}:
-                    raise lx.exceptions.InferenceConfigError(
-                        f"Unsupported parameter provided: {key}. This provider does not support it yet."
-                    )
-                config[key] = value
+        config = self._build_config(kwargs)
 
         # Use parallel processing for batches larger than 1
         if len(batch_prompts) > 1 and self.max_workers > 1:
@@ -294,3 +331,34 @@ class AzureOpenAILanguageModel(lx.inference.BaseLanguageModel):
             for prompt in batch_prompts:
                 result = self._process_single_prompt(prompt, config.copy())
                 yield [result]
+
+    def infer_stream(self, prompt: str, **kwargs: Any) -> Iterator[str]:
+        """Streams the completion for a single prompt as text chunks.
+
+        Args:
+            prompt: The prompt to complete.
+            **kwargs: Generation params, as accepted by ``infer``.
+
+        Yields:
+            Pieces of the response text as they arrive. Closing the generator
+            early (e.g. breaking out of a loop) closes the HTTP stream.
+        """
+        api_params = self._build_request(prompt, **self._build_config(kwargs))
+        try:
+            stream = self._client.chat.completions.create(**api_params, stream=True)
+        except Exception as e:
+            raise lx.exceptions.InferenceRuntimeError(
+                f'Azure OpenAI API error: {str(e)}', original=e
+            ) from e
+
+        try:
+            for chunk in stream:
+                # Azure may send chunks without choices (e.g. content filter results)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise lx.exceptions.InferenceRuntimeError(
+                f'Azure OpenAI API error: {str(e)}', original=e
+            ) from e
+        finally:
+            stream.close()
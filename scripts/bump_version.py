@@ -7,18 +7,37 @@ Usage:
     python scripts/bump_version.py major   # 0.1.0 -> 1.0.0
 """
 
+import ast
 import re
 import sys
 from pathlib import Path
 
-
-def get_current_version(init_file: Path) -> str:
-    """Extract current version from __init__.py file."""
-    content = init_file.read_text()
-    version_match = re.search(r'__version__ = ["\']([^"\']+)["\']', content)
-    if not version_match:
-        raise ValueError("Could not find __version__ in __init__.py")
-    return version_match.group(1)
+# Matches either `__version__ = "x.y.z"` (__init__.py) or a line-leading
+# `version = "x.y.z"` (pyproject.toml). Only the first match is replaced, which
+# in pyproject.toml is the [project] table entry; settings such as mypy's
+# `python_version` never match because of the line anchor.
+_ANY_VERSION_RE = re.compile(
+    r'(?P<init>__version__\s*=\s*["\'])[^"\']+(?P<initq>["\'])'
+    r'|(?P<toml>^version\s*=\s*["\'])[^"\']+(?P<tomlq>["\'])',
+    re.MULTILINE,
+)
+
+
+def get_current_version(init_text: str) -> str:
+    """Extract current version from the contents of __init__.py."""
+    tree = ast.parse(init_text)
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(
+                isinstance(target, ast.Name) and target.id == "__version__"
+                for target in node.targets
+            )
+            and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str)
+        ):
+            return node.value.value
+    raise ValueError("Could not find __version__ in __init__.py")
 
 
 def bump_version(current: str, bump_type: str) -> str:
@@ -44,26 +63,21 @@ def bump_version(current: str, bump_type: str) -> str:
     return f"{major}.{minor}.{patch}"
 
 
-def update_file_version(file_path: Path, old_version: str, new_version: str):
-    """Update version in a file."""
-    content = file_path.read_text()
+def update_file_version(
+    file_path: Path, content: str, old_version: str, new_version: str
+):
+    """Replace the version in content and write it to file_path.
 
-    if file_path.name == "__init__.py":
-        # Update __version__ = "x.y.z"
-        content = re.sub(
-            r'__version__ = ["\'][^"\']+["\']',
-            f'__version__ = "{new_version}"',
-            content,
-        )
-    elif file_path.name == "pyproject.toml":
-        # Update version = "x.y.z" in [project] section only
-        content = re.sub(
-            r'(\[project\].*?\n)version = ["\'][^"\']+["\']',
-            rf'\1version = "{new_version}"',
-            content,
-            flags=re.DOTALL,
-        )
+    content is the file's text as already read by the caller, so each file is
+    read once and written once.
+    """
+
+    def _replace(match: re.Match[str]) -> str:
+        if match.group("init") is not None:
+            return f'{match.group("init")}{new_version}{match.group("initq")}'
+        return f'{match.group("toml")}{new_version}{match.group("tomlq")}'
 
+    content = _ANY_VERSION_RE.sub(_replace, content, count=1)
     file_path.write_text(content)
     print(f"✅ Updated {file_path.name}: {old_version} -> {new_version}")
 
@@ -81,24 +95,32 @@ def main():
     pyproject_file = root_dir / "pyproject.toml"
 
     # Get current version
-    current_version = get_current_version(init_file)
+    init_text = init_file.read_text()
+    current_version = get_current_version(init_text)
     new_version = bump_version(current_version, bump_type)
 
     print(f"🔄 Bumping version: {current_version} -> {new_version}")
 
     # Update files
-    update_file_version(init_file, current_version, new_version)
-    update_file_version(pyproject_file, current_version, new_version)
-
-    print("\n✅ Version bump complete!")
-    print("\nNext steps:")
-    print(f"1. Update CHANGELOG.md with changes for v{new_version}")
-    print(
-        f"2. Commit changes: git add . && git commit -m 'bump: version {current_version} -> {new_version}'"
+    update_file_version(init_file, init_text, current_version, new_version)
+    update_file_version(
+        pyproject_file, pyproject_file.read_text(), current_version, new_version
+    )
+
+    sys.stdout.write(
+        "\n".join(
+            [
+                "\n✅ Version bump complete!",
+                "\nNext steps:",
+                f"1. Update CHANGELOG.md with changes for v{new_version}",
+                f"2. Commit changes: git add . && git commit -m 'bump: version {current_version} -> {new_version}'",
+                f"3. Create tag: git tag v{new_version}",
+                "4. Build package: uv build",
+                "5. Publish: uv publish",
+            ]
+        )
+        + "\n"
     )
-    print(f"3. Create tag: git tag v{new_version}")
-    print("4. Build package: uv build")
-    print("5. Publish: uv publish")
 
 
 if __name__ == "__main__":
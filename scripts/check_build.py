@@ -1,57 +1,94 @@
 #!/usr/bin/env python3
 """Build validation script for langextract-azureopenai package."""
 
+import glob
+import itertools
+import os
+import shlex
 import shutil
 import subprocess
 import sys
-import tempfile
-from pathlib import Path
-
-
-def run_command(cmd, description, check=True):
-    """Run a command and handle output."""
+import zipfile
+
+# Import check run inside the throwaway environment. argv[1] is the source
+# checkout; importing from there would mean the wheel was never exercised.
+_IMPORT_CHECK = """\
+import pathlib, sys
+import langextract_azureopenai as pkg
+location = pathlib.Path(pkg.__file__).resolve()
+if location.is_relative_to(pathlib.Path(sys.argv[1]).resolve()):
+    sys.exit(f"imported from the source tree, not the wheel: {location}")
+print(f"Version: {pkg.__version__} ({location.parent})")
+"""
+
+
+def run_command(cmd, description, check=True, stream=False):
+    """Run a command and handle output.
+
+    With ``stream=True`` output goes straight to the terminal instead of being
+    captured; use it for progress-only output such as ``uv build``.
+    """
     print(f"🔧 {description}...")
+    print(f"   $ {shlex.join(cmd)}")
     try:
-        result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True, check=check
-        )
-        if result.stdout.strip():
-            print(f"   ✓ {result.stdout.strip()}")
+        if stream:
+            result = subprocess.run(cmd, check=check, close_fds=False)
+        else:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, check=check, close_fds=False
+            )
+            if result.stdout.strip():
+                print(f"   ✓ {result.stdout.strip()}")
         return result.returncode == 0
     except subprocess.CalledProcessError as e:
-        print(f"   ❌ Failed: {e.stderr.strip()}")
+        if e.stderr is None:
+            print(f"   ❌ Failed: exit code {e.returncode}")
+        else:
+            print(f"   ❌ Failed: {e.stderr.strip()}")
+        return False
+    except OSError as e:
+        print(f"   ❌ Failed: {e}")
         return False
 
 
-def main():
-    """Run build validation checks."""
-    print("🚀 LangExtract Azure OpenAI - Build Validation")
-    print("=" * 50)
-
-    # Check UV is available
-    if not run_command("uv --version", "Checking UV installation"):
-        print("❌ UV is not installed. Please install it first.")
-        sys.exit(1)
-
-    # Clean previous builds
+def clean_and_build():
+    """Remove previous build outputs and build fresh artifacts into dist/."""
     print("\n🧹 Cleaning previous builds...")
-    for path in ["dist/", "build/", "*.egg-info/"]:
-        if Path(path).exists():
-            shutil.rmtree(path, ignore_errors=True)
+    for path in itertools.chain(
+        glob.iglob("dist"), glob.iglob("build"), glob.iglob("*.egg-info")
+    ):
+        shutil.rmtree(path, ignore_errors=True)
 
-    # Build package
     print("\n📦 Building package...")
-    if not run_command("uv build", "Building distribution packages"):
+    if not run_command(["uv", "build"], "Building distribution packages", stream=True):
         print("❌ Build failed!")
         sys.exit(1)
 
+
+def validate(skip_build=False):
+    """Validate the package build in dist/.
+
+    Args:
+        skip_build: Reuse the artifacts already in dist/ instead of cleaning
+            and rebuilding them first (``release.py`` builds via
+            ``clean_and_build`` before validating).
+    """
+    # Check UV is available
+    if not run_command(["uv", "--version"], "Checking UV installation"):
+        print("❌ UV is not installed. Please install it first.")
+        sys.exit(1)
+
+    if not skip_build:
+        clean_and_build()
+
     # Check build artifacts
-    dist_path = Path("dist")
-    if not dist_path.exists():
+    try:
+        with os.scandir("dist") as it:
+            artifacts = [entry for entry in it if not entry.name.startswith(".")]
+    except FileNotFoundError:
         print("❌ No dist/ directory created!")
         sys.exit(1)
 
-    artifacts = list(dist_path.glob("*"))
     if not artifacts:
         print("❌ No build artifacts found!")
         sys.exit(1)
@@ -61,38 +98,44 @@ def main():
         print(f"     - {artifact.name}")
 
     # Validate wheel content
-    wheel_files = list(dist_path.glob("*.whl"))
+    wheel_files = [entry for entry in artifacts if entry.name.endswith(".whl")]
     if wheel_files:
         print("\n🔍 Validating wheel content...")
         wheel_file = wheel_files[0]
-        py = sys.executable or "python"
-        if run_command(
-            f"{py} -m zipfile -l {wheel_file}", "Listing wheel contents", check=False
-        ):
+        print("🔧 Listing wheel contents...")
+        try:
+            with zipfile.ZipFile(wheel_file.path) as wheel:
+                names = wheel.namelist()
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"   ❌ Failed: {e}")
+        else:
+            print(*(f"     {name}" for name in names), sep="\n")
             print("   ✓ Wheel file is valid")
 
     # Test installation in temporary environment
     print("\n🧪 Testing installation...")
-    with tempfile.TemporaryDirectory() as temp_dir:
-        venv_path = Path(temp_dir) / "test_env"
-
-        # Create test environment
-        if not run_command(f"uv venv {venv_path}", "Creating test environment"):
-            print("❌ Failed to create test environment!")
-            sys.exit(1)
-
-        # Install package
-        wheel_file = wheel_files[0] if wheel_files else artifacts[0]
-        install_cmd = f"uv pip install --python {venv_path}/bin/python {wheel_file}"
-        if not run_command(install_cmd, "Installing package in test environment"):
-            print("❌ Failed to install package!")
-            sys.exit(1)
-
-        # Test import
-        test_import_cmd = f"{venv_path}/bin/python -c 'import langextract_azureopenai; print(f\"Version: {{langextract_azureopenai.__version__}}\")'"
-        if not run_command(test_import_cmd, "Testing package import"):
-            print("❌ Failed to import package!")
-            sys.exit(1)
+    # `uv run --isolated --with` installs the wheel into a throwaway environment
+    # and runs the import check there in a single invocation. `--no-project`
+    # keeps uv from installing the local source tree instead of the wheel, and
+    # `python -I` keeps the current directory (the checkout) off sys.path so
+    # the import cannot silently resolve to the sources.
+    wheel_file = wheel_files[0] if wheel_files else artifacts[0]
+    test_install_cmd = [
+        "uv",
+        "run",
+        "--isolated",
+        "--no-project",
+        "--with",
+        wheel_file.path,
+        "python",
+        "-I",
+        "-c",
+        _IMPORT_CHECK,
+        os.getcwd(),
+    ]
+    if not run_command(test_install_cmd, "Installing and importing package"):
+        print("❌ Failed to install or import package!")
+        sys.exit(1)
 
     print("\n✅ All build validation checks passed!")
     print("📋 Summary:")
@@ -102,5 +145,12 @@ def main():
     print("   - Import test: ✓")
 
 
+def main():
+    """Run build validation checks."""
+    print("🚀 LangExtract Azure OpenAI - Build Validation")
+    print("=" * 50)
+    validate(skip_build=False)
+
+
 if __name__ == "__main__":
     main()
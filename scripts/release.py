@@ -1,50 +1,59 @@
 #!/usr/bin/env python3
-"""Release automation script for langextract-azureopenai package."""
+"""Release automation script for langextract-azureopenai package.
 
+Usage:
+    python scripts/release.py                  # interactive prompts
+    python scripts/release.py --bump patch --yes --push --publish
+
+Passing any option (or running without a TTY) disables the prompts; every
+answer then comes from the command line. The PyPI token is read from the
+environment variable named by --pypi-token-env.
+"""
+
+import argparse
+import os
 import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
+import check_build
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python 3.10
+    import tomli as tomllib
+
 
 def run_command(cmd, description, check=True):
     """Run a command and handle output."""
     print(f"🔧 {description}...")
     try:
         result = subprocess.run(
-            cmd, shell=True, capture_output=True, text=True, check=check
+            cmd, capture_output=True, text=True, check=check, close_fds=False
         )
         if result.stdout.strip():
             print(f"   ✓ {result.stdout.strip()}")
         return result
     except subprocess.CalledProcessError as e:
-        print(f"   ❌ Failed: {e.stderr.strip()}")
+        if e.stderr is None:
+            print(f"   ❌ Failed: exit code {e.returncode}")
+        else:
+            print(f"   ❌ Failed: {e.stderr.strip()}")
         if check:
             sys.exit(1)
         return e
+    except OSError as e:
+        print(f"   ❌ Failed: {e}")
+        if check:
+            sys.exit(1)
+        return subprocess.CompletedProcess(cmd, 127, "", str(e))
 
 
 def get_current_version():
     """Get current version from pyproject.toml."""
-    try:
-        result = subprocess.run(
-            [
-                "python",
-                "-c",
-                "import tomllib; print(tomllib.load(open('pyproject.toml', 'rb'))['project']['version'])",
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return result.stdout.strip()
-    except Exception:
-        # Fallback to reading manually
-        with open("pyproject.toml") as f:
-            for line in f:
-                if line.strip().startswith("version ="):
-                    return line.split("=")[1].strip().strip('"')
-    return "unknown"
+    with open("pyproject.toml", "rb") as f:
+        return tomllib.load(f)["project"]["version"]
 
 
 def confirm_action(message):
@@ -53,8 +62,49 @@ def confirm_action(message):
     return response in ['y', 'yes']
 
 
+def parse_args(argv=None):
+    """Parse command line options for unattended releases."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--bump",
+        choices=["patch", "minor", "major", "none"],
+        default="none",
+        help="version bump to apply (default: none)",
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="continue past uncommitted changes / test failures and confirm release",
+    )
+    parser.add_argument(
+        "--push", action="store_true", help="push commits and tags after tagging"
+    )
+    parser.add_argument("--publish", action="store_true", help="publish to PyPI")
+    parser.add_argument(
+        "--pypi-token-env",
+        default="UV_PUBLISH_TOKEN",
+        metavar="NAME",
+        help="environment variable holding the PyPI token (default: %(default)s)",
+    )
+    if argv is None:
+        argv = sys.argv[1:]
+    args = parser.parse_args(argv)
+    # Keep the original prompt-driven flow when run bare from a terminal
+    args.interactive = not argv and sys.stdin.isatty()
+    return args
+
+
+def ask(args, message, answer):
+    """Prompt when interactive, otherwise return the command line answer."""
+    if args.interactive:
+        return confirm_action(message)
+    return answer
+
+
 def main():
     """Run release process."""
+    args = parse_args()
+
     print("🚀 LangExtract Azure OpenAI - Release Process")
     print("=" * 50)
 
@@ -63,6 +113,16 @@ def main():
         print("❌ Please run this script from the project root directory")
         sys.exit(1)
 
+    # An unattended run that asked to publish must have its token up front,
+    # before anything is bumped, committed or tagged
+    if (
+        not args.interactive
+        and args.publish
+        and not os.environ.get(args.pypi_token_env, "").strip()
+    ):
+        print(f"❌ --publish requires a PyPI token in ${args.pypi_token_env}")
+        sys.exit(1)
+
     # Get current version
     current_version = get_current_version()
     print(f"📋 Current version: {current_version}")
@@ -70,40 +130,45 @@ def main():
     # Check git status
     print("\n🔍 Checking git status...")
     git_status = run_command(
-        "git status --porcelain", "Getting git status", check=False
+        ["git", "status", "--porcelain"], "Getting git status", check=False
     )
     if git_status.stdout.strip():
         print("⚠️  Warning: You have uncommitted changes:")
         print(git_status.stdout)
-        if not confirm_action("Continue with uncommitted changes?"):
+        if not ask(args, "Continue with uncommitted changes?", args.yes):
             print("❌ Aborting release.")
             sys.exit(1)
 
     # Run test suite
     print("\n🧪 Running test suite...")
     test_result = run_command(
-        "python scripts/run_tests.py", "Running comprehensive tests", check=False
+        ["python", "scripts/run_tests.py"],
+        "Running comprehensive tests",
+        check=False,
     )
     if test_result.returncode != 0:
         print("❌ Tests failed! Please fix issues before release.")
-        if not confirm_action("Continue despite test failures?"):
+        if not ask(args, "Continue despite test failures?", args.yes):
             sys.exit(1)
 
     # Ask for version bump
-    print(f"\n📈 Current version: {current_version}")
-    print("Version bump options:")
-    print("  1. patch (e.g., 1.0.0 -> 1.0.1)")
-    print("  2. minor (e.g., 1.0.0 -> 1.1.0)")
-    print("  3. major (e.g., 1.0.0 -> 2.0.0)")
-    print("  4. skip version bump")
+    bump_type = None if args.bump == "none" else args.bump
+    if args.interactive:
+        print(f"\n📈 Current version: {current_version}")
+        print("Version bump options:")
+        print("  1. patch (e.g., 1.0.0 -> 1.0.1)")
+        print("  2. minor (e.g., 1.0.0 -> 1.1.0)")
+        print("  3. major (e.g., 1.0.0 -> 2.0.0)")
+        print("  4. skip version bump")
 
-    choice = input("Select version bump (1-4): ").strip()
+        choice = input("Select version bump (1-4): ").strip()
+        if choice in ['1', '2', '3']:
+            bump_type = ['patch', 'minor', 'major'][int(choice) - 1]
 
-    if choice in ['1', '2', '3']:
-        bump_type = ['patch', 'minor', 'major'][int(choice) - 1]
+    if bump_type:
         print(f"\n📝 Bumping version ({bump_type})...")
         run_command(
-            f"python scripts/bump_version.py {bump_type}",
+            ["python", "scripts/bump_version.py", bump_type],
             f"Bumping {bump_type} version",
         )
         new_version = get_current_version()
@@ -112,14 +177,14 @@ def main():
         new_version = current_version
         print("   ⏭️  Skipping version bump")
 
-    # Build package
-    print("\n📦 Building package...")
-    run_command("rm -rf dist/ build/ *.egg-info/", "Cleaning previous builds")
-    run_command("uv build", "Building distribution packages")
+    # Build package (same clean + build steps as check_build.py)
+    check_build.clean_and_build()
 
     # Validate build
     print("\n🔍 Validating build...")
-    run_command("python scripts/check_build.py", "Validating package build")
+    # Validate the artifacts built above in-process rather than letting
+    # check_build.py clean and rebuild dist/ a second time
+    check_build.validate(skip_build=True)
 
     # Show what will be released
     print("\n📋 Release Summary:")
@@ -127,55 +192,77 @@ def main():
     print(f"   Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     # List build artifacts
-    dist_files = list(Path("dist").glob("*"))
+    with os.scandir("dist") as it:
+        dist_files = [entry for entry in it if not entry.name.startswith(".")]
     print(f"   Artifacts: {len(dist_files)} files")
-    for file in dist_files:
-        print(f"     - {file.name}")
+    for entry in dist_files:
+        print(f"     - {entry.name}")
 
     # Confirm release
-    if not confirm_action(f"\n🚀 Ready to release version {new_version}?"):
+    if not ask(args, f"\n🚀 Ready to release version {new_version}?", args.yes):
         print("❌ Release cancelled.")
         sys.exit(1)
 
     # Commit version changes (if any)
-    if choice in ['1', '2', '3']:
+    if bump_type:
         print("\n📝 Committing version changes...")
         run_command(
-            "git add pyproject.toml langextract_azureopenai/__init__.py",
+            ["git", "add", "pyproject.toml", "langextract_azureopenai/__init__.py"],
             "Staging version files",
         )
         run_command(
-            f'git commit -m "Bump version to {new_version}"', "Committing version bump"
+            ["git", "commit", "-m", f"Bump version to {new_version}"],
+            "Committing version bump",
         )
 
     # Create git tag
     print(f"\n🏷️  Creating git tag v{new_version}...")
     run_command(
-        f'git tag -a v{new_version} -m "Release version {new_version}"',
+        [
+            "git",
+            "tag",
+            "-a",
+            f"v{new_version}",
+            "-m",
+            f"Release version {new_version}",
+        ],
         "Creating git tag",
     )
 
     # Push to repository
-    if confirm_action("Push changes and tags to repository?"):
+    if ask(args, "Push changes and tags to repository?", args.push):
         print("\n📤 Pushing to repository...")
-        run_command("git push", "Pushing commits")
-        run_command("git push --tags", "Pushing tags")
+        run_command(["git", "push"], "Pushing commits")
+        run_command(["git", "push", "--tags"], "Pushing tags")
 
     # Publish to PyPI
-    if confirm_action("Publish to PyPI?"):
+    if ask(args, "Publish to PyPI?", args.publish):
         print("\n🌍 Publishing to PyPI...")
-        token = input("Enter PyPI API token (or press Enter to skip): ").strip()
+        if args.interactive:
+            token = input("Enter PyPI API token (or press Enter to skip): ").strip()
+        else:
+            token = os.environ.get(args.pypi_token_env, "").strip()
         if token:
-            run_command(f"uv publish --token {token}", "Publishing to PyPI")
+            run_command(["uv", "publish", "--token", token], "Publishing to PyPI")
+        elif not args.interactive:
+            print(f"❌ No PyPI token in ${args.pypi_token_env}; nothing published")
+            sys.exit(1)
         else:
             print("   ⏭️  Skipping PyPI publication")
             print("   💡 You can publish later with: uv publish --token YOUR_TOKEN")
 
-    print(f"\n🎉 Release {new_version} completed successfully!")
-    print("\n📋 Next steps:")
-    print("   - Update GitHub release notes")
-    print("   - Announce release in relevant channels")
-    print("   - Update documentation if needed")
+    sys.stdout.write(
+        "\n".join(
+            [
+                f"\n🎉 Release {new_version} completed successfully!",
+                "\n📋 Next steps:",
+                "   - Update GitHub release notes",
+                "   - Announce release in relevant channels",
+                "   - Update documentation if needed",
+            ]
+        )
+        + "\n"
+    )
 
 
 if __name__ == "__main__":
@@ -2,48 +2,87 @@
 """Comprehensive test runner for langextract-azureopenai package."""
 
 import os
+import shlex
 import shutil
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+_print_lock = threading.Lock()
 
-def run_command(cmd, description):
-    """Run a command and display results."""
-    print(f"\n🔧 {description}")
-    print("=" * 60)
+# Resolve executables once; every command below is built from these.
+UV = shutil.which("uv")
+PY = sys.executable or "python3"
+
+
+def uv_or_py(*tail):
+    """Build argv for a tool, via ``uv run`` when available.
+
+    Without uv, ``python`` maps to the current interpreter and any other tool
+    is run as ``python -m <tool>``.
+    """
+    if UV:
+        return [UV, "run", *tail]
+    tool, *args = tail
+    if tool == "python":
+        return [PY, *args]
+    return [PY, "-m", tool, *args]
+
+
+def run_command(cmd, description, capture=False):
+    """Run a command and display results.
+
+    With ``capture=True`` the command output is buffered and printed in one
+    block once it exits, so commands run concurrently do not interleave.
+    """
+    lines = [f"\n🔧 {description}", "=" * 60, f"$ {shlex.join(cmd)}"]
+    if not capture:
+        print("\n".join(lines))
+        lines = []
 
     try:
-        result = subprocess.run(cmd, shell=True, check=False)
+        result = subprocess.run(
+            cmd, check=False, close_fds=False, capture_output=capture, text=True
+        )
+        if capture:
+            lines.extend(out for out in (result.stdout, result.stderr) if out)
         if result.returncode == 0:
-            print(f"✅ {description} - PASSED")
-            return True
+            lines.append(f"✅ {description} - PASSED")
+            ok = True
         else:
-            print(f"❌ {description} - FAILED (exit code: {result.returncode})")
-            return False
+            lines.append(f"❌ {description} - FAILED (exit code: {result.returncode})")
+            ok = False
     except Exception as e:
-        print(f"❌ {description} - ERROR: {e}")
-        return False
+        lines.append(f"❌ {description} - ERROR: {e}")
+        ok = False
+
+    with _print_lock:
+        print("\n".join(line.rstrip("\n") for line in lines))
+    return ok
 
 
 def main():
     """Run comprehensive test suite."""
     print("🧪 LangExtract Azure OpenAI - Test Suite")
     print("=" * 60)
-    results = []
-
-    # Detect uv availability
-    has_uv = shutil.which("uv") is not None
-    py = sys.executable or "python3"
+    # (step name, passed); passed is None for skipped steps
+    results: list[tuple[str, bool | None]] = []
 
     # 0. Ensure dev dependencies are installed (best-effort)
-    if has_uv:
-        results.append(run_command("uv sync --extra dev", "Install dev dependencies"))
+    if UV:
+        description = "Install dev dependencies"
+        results.append(
+            (description, run_command([UV, "sync", "--extra", "dev"], description))
+        )
     else:
         print("\n⚠️  'uv' not found. Installing dev extras with pip...")
+        description = "Install dev dependencies via pip"
         results.append(
-            run_command(
-                f"{py} -m pip install -e .[dev]", "Install dev dependencies via pip"
+            (
+                description,
+                run_command([PY, "-m", "pip", "install", "-e", ".[dev]"], description),
             )
         )
 
@@ -55,34 +94,33 @@ def main():
     # Track test results (continuing after dependency install)
 
     # 1. Code formatting checks
-    fmt_black = "uv run black --check ." if has_uv else "black --check ."
-    fmt_isort = "uv run isort --check-only ." if has_uv else "isort --check-only ."
-    results.append(run_command(fmt_black, "Code formatting (black)"))
-    results.append(run_command(fmt_isort, "Import sorting (isort)"))
+    fmt_black = uv_or_py("black", "--check", ".")
+    fmt_isort = uv_or_py("isort", "--check-only", ".")
 
     # 2. Linting
-    lint_cmd = "uv run ruff check ." if has_uv else "ruff check ."
-    results.append(run_command(lint_cmd, "Code linting (ruff)"))
+    lint_cmd = uv_or_py("ruff", "check", ".")
 
     # 3. Type checking
-    mypy_cmd = (
-        "uv run mypy langextract_azureopenai"
-        if has_uv
-        else f"{py} -m mypy langextract_azureopenai"
-    )
-    results.append(run_command(mypy_cmd, "Type checking (mypy)"))
-
-    # 4. Unit tests
-    unit_cmd = (
-        "uv run pytest -m unit tests/ -v"
-        if has_uv
-        else f"{py} -m pytest -m unit tests/ -v"
-    )
-    results.append(run_command(unit_cmd, "Unit tests"))
-
-    # 5. Parameter filtering tests are included in unit tests via markers; no separate run
+    mypy_cmd = uv_or_py("mypy", "langextract_azureopenai")
+
+    # Steps 1-3 are read-only checks, so run them concurrently. Tests, coverage
+    # and the build stay sequential because they share .coverage and dist/.
+    parallel = [
+        (fmt_black, "Code formatting (black)"),
+        (fmt_isort, "Import sorting (isort)"),
+        (lint_cmd, "Code linting (ruff)"),
+        (mypy_cmd, "Type checking (mypy)"),
+    ]
+    with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+        futures = [
+            (description, executor.submit(run_command, cmd, description, capture=True))
+            for cmd, description in parallel
+        ]
+        results.extend(
+            (description, future.result()) for description, future in futures
+        )
 
-    # 6. Integration tests (only if credentials are available)
+    # 4. Integration tests (only if credentials are available)
     has_credentials = (
         os.getenv("AZURE_OPENAI_API_KEY")
         and os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -91,59 +129,49 @@ def main():
 
     if has_credentials:
         print("\n🔐 Azure credentials found - running integration tests")
-        integ_cmd = (
-            "uv run python tests/test_azure_parameters.py"
-            if has_uv
-            else f"{py} tests/test_azure_parameters.py"
-        )
-        results.append(run_command(integ_cmd, "Azure API parameter tests"))
+        integ_cmd = uv_or_py("python", "tests/test_azure_parameters.py")
+        description = "Azure API parameter tests"
+        results.append((description, run_command(integ_cmd, description)))
     else:
         print("\n⚠️  No Azure credentials found - skipping integration tests")
         print(
             "   Set AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT, and AZURE_OPENAI_API_VERSION to run them"
         )
-
-    # 7. Coverage report
-    cov_cmd = (
-        "uv run pytest tests/ --cov=langextract_azureopenai --cov-report=term-missing --cov-report=html"
-        if has_uv
-        else f"{py} -m pytest tests/ --cov=langextract_azureopenai --cov-report=term-missing --cov-report=html"
+        results.append(("Azure API parameter tests", None))
+
+    # 5. Unit tests with coverage report. A single pytest run covers the whole
+    # suite (unit and parameter filtering tests included), so there is no
+    # separate `pytest -m unit` pass. Integration tests are deselected: the
+    # live sweep already ran as a script in step 4.
+    cov_cmd = uv_or_py(
+        "pytest",
+        "tests/",
+        "-m",
+        "not integration",
+        "--cov=langextract_azureopenai",
+        "--cov-report=term-missing",
+        "--cov-report=html",
     )
-    results.append(run_command(cov_cmd, "Coverage analysis"))
+    description = "Unit tests with coverage"
+    results.append((description, run_command(cov_cmd, description)))
 
-    # 8. Package build test
-    build_cmd = (
-        "uv run python scripts/check_build.py"
-        if has_uv
-        else f"{py} scripts/check_build.py"
-    )
-    results.append(run_command(build_cmd, "Package build validation"))
+    # 6. Package build test
+    build_cmd = uv_or_py("python", "scripts/check_build.py")
+    description = "Package build validation"
+    results.append((description, run_command(build_cmd, description)))
 
     # Summary
     print("\n" + "=" * 60)
     print("📊 TEST SUMMARY")
     print("=" * 60)
 
-    passed = sum(results)
-    total = len(results)
-
-    for _i, (description, passed_test) in enumerate(
-        [
-            ("Code formatting (black)", results[0]),
-            ("Import sorting (isort)", results[1]),
-            ("Code linting (ruff)", results[2]),
-            ("Type checking (mypy)", results[3]),
-            ("Unit tests", results[4]),
-            ("Parameter filtering tests", results[5]),
-            ("Integration tests", results[6] if has_credentials else None),
-            ("Coverage analysis", results[6 if has_credentials else 5]),
-            ("Package build validation", results[7 if has_credentials else 6]),
-        ],
-        1,
-    ):
-        if passed_test is None:
+    passed = sum(1 for _, ok in results if ok)
+    total = sum(1 for _, ok in results if ok is not None)
+
+    for description, ok in results:
+        if ok is None:
             print(f"⏭️  {description} - SKIPPED")
-        elif passed_test:
+        elif ok:
             print(f"✅ {description} - PASSED")
         else:
             print(f"❌ {description} - FAILED")
@@ -1,51 +1,95 @@
 """Pytest configuration and fixtures for langextract-azureopenai tests.
 
 Notes:
-- `tests/test_azure_parameters.py` is a script-style integration validator that is
-  executed directly (e.g., via `python tests/test_azure_parameters.py`) when you
-  have real Azure credentials. It is not a pytest test module and should be
-  excluded from pytest collection to avoid fixture resolution errors.
+- `tests/test_azure_parameters.py` is both a script-style validator
+  (`python tests/test_azure_parameters.py`) and a pytest module whose
+  `integration` tests skip unless real Azure credentials are set.
 """
 
 import os
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 
-# Exclude the script-style integration validator from pytest collection. This
-# prevents errors like "fixture 'param_name' not found" during unit test runs.
-# It remains executable directly via `python tests/test_azure_parameters.py`.
-collect_ignore = ["test_azure_parameters.py"]
+
+@pytest.fixture(scope="session", autouse=True)
+def _load_plugins():
+    """Scan provider entry points once per session, before any test runs."""
+    import langextract as lx
+
+    lx.providers.load_plugins_once()
+
+
+@pytest.fixture(scope="session")
+def mock_completion_response():
+    """Successful chat completion response, built once per session.
+
+    A plain SimpleNamespace tree rather than MagicMock: tests only read from
+    it, so there is nothing to record and attribute access stays cheap.
+    """
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content="Mock response content"),
+                finish_reason="stop",
+            )
+        ],
+        usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+    )
+
+
+_TEST_CREDENTIALS = {
+    'AZURE_OPENAI_API_KEY': 'test-api-key',
+    'AZURE_OPENAI_ENDPOINT': 'https://test.openai.azure.com/',
+    'AZURE_OPENAI_API_VERSION': '2024-12-01-preview',
+}
 
 
 @pytest.fixture
 def mock_azure_credentials():
     """Mock Azure OpenAI credentials for testing."""
-    with patch.dict(
-        os.environ,
-        {
-            'AZURE_OPENAI_API_KEY': 'test-api-key',
-            'AZURE_OPENAI_ENDPOINT': 'https://test.openai.azure.com/',
-            'AZURE_OPENAI_API_VERSION': '2024-12-01-preview',
-        },
-    ):
+    with patch.dict(os.environ, _TEST_CREDENTIALS):
         yield
 
 
 @pytest.fixture
-def mock_openai_client():
+def mock_openai_client(mock_completion_response):
     """Mock the AzureOpenAI client to avoid real API calls."""
     with patch('openai.AzureOpenAI') as mock_client_class:
         mock_client = mock_client_class.return_value
+        mock_client.chat.completions.create.return_value = mock_completion_response
+        yield mock_client
 
-        # Mock successful response
-        mock_response = type('MockResponse', (), {})()
-        mock_response.choices = [type('MockChoice', (), {})()]
-        mock_response.choices[0].message = type('MockMessage', (), {})()
-        mock_response.choices[0].message.content = "Mock response content"
 
-        mock_client.chat.completions.create.return_value = mock_response
-        yield mock_client
+@pytest.fixture(scope="class")
+def class_openai_client(mock_completion_response):
+    """Mocked AzureOpenAI client backing the class-scoped `provider`.
+
+    Owns its own credentials and client patches so both start and stop with
+    the test class. Tests asserting on calls should reset it first.
+    """
+    with patch.dict(os.environ, _TEST_CREDENTIALS):
+        with patch('openai.AzureOpenAI') as mock_client_class:
+            mock_client = mock_client_class.return_value
+            mock_client.chat.completions.create.return_value = mock_completion_response
+            yield mock_client
+
+
+@pytest.fixture(scope="class")
+def provider(class_openai_client):
+    """Provider built once per test class on top of the mocked client.
+
+    Tests that change provider state (e.g. applying a schema) should build
+    their own instance instead.
+    """
+    from langextract_azureopenai import AzureOpenAILanguageModel
+
+    return AzureOpenAILanguageModel(
+        model_id="azureopenai-gpt-4",
+        api_key="test-key",
+        azure_endpoint="https://test.openai.azure.com/",
+    )
 
 
 @pytest.fixture
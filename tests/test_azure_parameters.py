@@ -3,16 +3,48 @@
 
 This script tests each parameter in _AZURE_OPENAI_CONFIG_KEYS to ensure
 they work correctly with actual Azure OpenAI API calls.
+
+Parameter values are tested concurrently; set AZURE_OPENAI_TEST_CONCURRENCY
+to change how many requests are in flight at once (default: 8).
+
+Set AZURE_OPENAI_TEST_CACHE to a file path to reuse responses to deterministic
+requests (temperature=0 or a fixed seed) across runs instead of calling the API
+again.
+
+The parameter sweep is also collected by pytest as `test_param` (marked
+`integration`, skipped without credentials). With pytest-xdist installed,
+`pytest -m integration -n 8 --dist=loadgroup` spreads the values across workers
+while keeping every value of one parameter on the same worker.
 """
 
+import asyncio
+import hashlib
+import importlib.util
 import json
 import os
+import random
 import sys
-from typing import Any
-
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator, Sequence
+from typing import Any, TypeVar
+
+import httpx
 import langextract as lx
+import openai
+import pytest
 
 from langextract_azureopenai import AzureOpenAILanguageModel
+from langextract_azureopenai.provider import _UNSUPPORTED_CONFIG_KEYS
+
+try:
+    import orjson
+except ImportError:  # Optional: only speeds up writing the results file
+    orjson = None
+
+E = TypeVar("E", bound=BaseException)
 
 # Test parameters with safe values
 TEST_PARAMETERS = {
@@ -35,6 +67,119 @@ TEST_PARAMETERS = {
     'parallel_tool_calls': [True, False],
 }
 
+# Bound on in-flight requests, kept low enough to respect Azure TPM/RPM quotas
+MAX_CONCURRENCY = int(os.getenv("AZURE_OPENAI_TEST_CONCURRENCY", "8"))
+# Attempts per request when Azure answers 429 Too Many Requests. This is the
+# only retry layer: sweep providers are built with the SDK's retries disabled.
+MAX_ATTEMPTS = 5
+# Combinations not yet sent are skipped after this many in a row end rate
+# limited despite retries
+MAX_CONSECUTIVE_RATE_LIMITS = 3
+# In-flight combination requests; at most MAX_CONSECUTIVE_RATE_LIMITS +
+# COMBINATION_CONCURRENCY - 1 are sent before the breaker above trips
+COMBINATION_CONCURRENCY = 2
+# Optional on-disk response cache for deterministic requests
+CACHE_PATH = os.getenv("AZURE_OPENAI_TEST_CACHE")
+
+
+class CachedProvider:
+    """Provider wrapper that serves repeated deterministic requests from disk.
+
+    Entries are keyed on the deployment, endpoint and API version plus the
+    prompt and the full set of request kwargs, so a cached answer only ever
+    stands in for the exact same request. Requests that sample (no seed and a
+    non-zero temperature) are never cached.
+
+    The file may be shared by several processes (e.g. pytest-xdist workers):
+    saving merges with what is on disk and replaces the file atomically, and
+    an unreadable file is treated as an empty cache.
+    """
+
+    def __init__(self, provider: AzureOpenAILanguageModel, path: str) -> None:
+        self._provider = provider
+        self._path = path
+        self._lock = threading.Lock()
+        self._entries = self._load(path)
+
+    @staticmethod
+    def _load(path: str) -> dict[str, str]:
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._provider, name)
+
+    @staticmethod
+    def _is_deterministic(kwargs: dict[str, Any]) -> bool:
+        return kwargs.get('seed') is not None or kwargs.get('temperature') == 0
+
+    def _key(self, prompt: str, kwargs: dict[str, Any]) -> str:
+        payload = json.dumps(
+            {
+                "deployment_name": self._provider.deployment_name,
+                "azure_endpoint": self._provider.azure_endpoint,
+                "api_version": self._provider.api_version,
+                "prompt": prompt,
+                "kwargs": kwargs,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def infer(
+        self, batch_prompts: Sequence[str], **kwargs: Any
+    ) -> Iterator[Sequence[lx.inference.ScoredOutput]]:
+        if not self._is_deterministic(kwargs):
+            yield from self._provider.infer(batch_prompts, **kwargs)
+            return
+
+        for prompt in batch_prompts:
+            key = self._key(prompt, kwargs)
+            with self._lock:
+                output = self._entries.get(key)
+            if output is None:
+                outputs = next(iter(self._provider.infer([prompt], **kwargs)))
+                output = outputs[0].output
+                with self._lock:
+                    self._entries[key] = output
+            yield [lx.inference.ScoredOutput(score=1.0, output=output)]
+
+    def save(self) -> None:
+        """Merge the cache into the file on disk, replacing it atomically."""
+        with self._lock:
+            entries = {**self._load(self._path), **self._entries}
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self._path)), suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+
+def build_http_client() -> httpx.Client:
+    """Shared HTTP client sized for the concurrent sweep.
+
+    Every request reuses one keep-alive pool; HTTP/2 multiplexing is enabled
+    when the optional `h2` package is installed (``pip install httpx[http2]``).
+    """
+    return openai.DefaultHttpxClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=MAX_CONCURRENCY * 2,
+            max_keepalive_connections=MAX_CONCURRENCY,
+        ),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+
 
 def check_environment() -> tuple[str, str, str]:
     """Check if required environment variables are set."""
@@ -55,21 +200,62 @@ def check_environment() -> tuple[str, str, str]:
     return api_key, endpoint, version
 
 
-def test_parameter(
+def _find_cause(error: BaseException | None, exc_type: type[E]) -> E | None:
+    """Return the first exception of exc_type in error's ``__cause__`` chain.
+
+    The provider re-raises SDK errors as InferenceRuntimeError, so the typed
+    openai exception is usually one or more links down the chain.
+    """
+    while error is not None:
+        if isinstance(error, exc_type):
+            return error
+        error = error.__cause__
+    return None
+
+
+def _is_rate_limited(error: BaseException | None) -> bool:
+    """Whether error (or an exception it was raised from) is an HTTP 429."""
+    return _find_cause(error, openai.RateLimitError) is not None
+
+
+def _infer_with_retry(
+    provider: AzureOpenAILanguageModel, prompts: list[str], **kwargs: Any
+) -> list:
+    """Run provider.infer, backing off exponentially on rate limits."""
+    attempt = 0
+    while True:
+        try:
+            return list(provider.infer(prompts, **kwargs))
+        except Exception as e:
+            attempt += 1
+            if attempt >= MAX_ATTEMPTS or not _is_rate_limited(e):
+                raise
+            # Exponential backoff with jitter so concurrent workers spread out
+            time.sleep(min(2 ** (attempt - 1), 30) + random.uniform(0, 1))
+
+
+def check_parameter(
     param_name: str, param_value: Any, provider: AzureOpenAILanguageModel
 ) -> dict[str, Any]:
     """Test a single parameter with the Azure OpenAI provider."""
-    print(f"  Testing {param_name}={param_value}...")
-
-    # Simple test prompt
-    test_prompt = "Say 'Hello, this is a test response.' and nothing else."
+    # One write per line: print() emits the text and the newline separately,
+    # which lets lines from concurrent sweep threads interleave.
+    sys.stdout.write(f"  Testing {param_name}={param_value}...\n")
+
+    # Simple test prompt. JSON mode is rejected with a 400 unless the messages
+    # mention JSON, and the provider only adds its JSON system message when
+    # structured output is enabled, so ask for JSON explicitly there.
+    if param_name == 'response_format' and param_value.get('type') == 'json_object':
+        test_prompt = 'Return the JSON object {"message": "Hello"} and nothing else.'
+    else:
+        test_prompt = "Say 'Hello, this is a test response.' and nothing else."
 
     try:
         # Special handling for logprobs-related parameters
         kwargs = {param_name: param_value}
 
-        # If testing top_logprobs, we need logprobs=True
-        if param_name == 'top_logprobs' and param_value > 0:
+        # top_logprobs requires logprobs=True for every value, including 0
+        if param_name == 'top_logprobs':
             kwargs['logprobs'] = True
 
         # If testing tools or tool_choice, skip for now (requires complex setup)
@@ -77,7 +263,7 @@ def test_parameter(
             return {"status": "skipped", "reason": "Complex tool setup required"}
 
         # Run inference with the parameter
-        results = list(provider.infer([test_prompt], **kwargs))
+        results = _infer_with_retry(provider, [test_prompt], **kwargs)
 
         if results and results[0] and results[0][0].output:
             response_text = results[0][0].output
@@ -94,16 +280,90 @@ def test_parameter(
             return {"status": "error", "error": "No response received"}
 
     except Exception as e:
-        error_msg = str(e)
-        # Check for specific API errors that might indicate parameter issues
-        if "400" in error_msg or "invalid" in error_msg.lower():
-            return {"status": "invalid_parameter", "error": error_msg}
-        else:
-            return {"status": "api_error", "error": error_msg}
+        # A 400 from the API means the parameter (or its value) was rejected
+        if (bad_request := _find_cause(e, openai.BadRequestError)) is not None:
+            return {"status": "invalid_parameter", "error": str(bad_request)}
+        if (status_error := _find_cause(e, openai.APIStatusError)) is not None:
+            return {
+                "status": "api_error",
+                "error": f"{status_error.status_code}: {status_error.message}",
+            }
+        return {"status": "error", "error": str(e)}
+
+
+def estimate_cost(param_name: str, param_value: Any) -> int:
+    """Rough relative latency of a sweep request, used only for ordering."""
+    if param_name == 'top_logprobs':
+        # Implies logprobs=True; more alternatives per token mean a bigger body
+        return 2 + param_value
+    if param_name == 'logprobs' and param_value:
+        return 2
+    if param_name == 'response_format' and param_value.get('type') == 'json_object':
+        return 2
+    if param_name == 'stop' and isinstance(param_value, list):
+        return len(param_value)
+    return 0
+
+
+async def check_parameter_async(
+    param_name: str,
+    param_value: Any,
+    provider: AzureOpenAILanguageModel,
+    semaphore: asyncio.Semaphore,
+) -> dict[str, Any]:
+    """Run check_parameter in a worker thread once a concurrency slot is free."""
+    async with semaphore:
+        return await asyncio.to_thread(
+            check_parameter, param_name, param_value, provider
+        )
 
 
-def test_parameter_combinations(provider: AzureOpenAILanguageModel) -> dict[str, Any]:
-    """Test common parameter combinations."""
+async def run_parameter_sweep(
+    provider: AzureOpenAILanguageModel,
+) -> dict[str, list[tuple[Any, dict[str, Any]]]]:
+    """Test every value in TEST_PARAMETERS concurrently.
+
+    Returns the ``(value, result)`` pairs for each parameter, in
+    TEST_PARAMETERS order.
+
+    Values are not folded into one multi-prompt ``provider.infer`` call:
+    ``infer`` applies a single set of kwargs to the whole batch, and every
+    value here is a different kwarg, so each one has to be its own request.
+    All requests share the provider's client and therefore its HTTP
+    connection pool, so the connection/TLS setup is paid once.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    tasks = [
+        (param_name, value)
+        for param_name, test_values in TEST_PARAMETERS.items()
+        for value in test_values
+    ]
+    # Start the slowest requests first so they don't end up as stragglers
+    # behind a full pool (longest-processing-time-first scheduling).
+    order = sorted(
+        range(len(tasks)), key=lambda i: estimate_cost(*tasks[i]), reverse=True
+    )
+    outcomes = await asyncio.gather(
+        *(check_parameter_async(*tasks[i], provider, semaphore) for i in order)
+    )
+    outcome_by_index = dict(zip(order, outcomes, strict=True))
+
+    test_results: dict[str, list[tuple[Any, dict[str, Any]]]] = defaultdict(list)
+    for i, (param_name, value) in enumerate(tasks):
+        test_results[param_name].append((value, outcome_by_index[i]))
+    return test_results
+
+
+async def check_parameter_combinations(
+    provider: AzureOpenAILanguageModel,
+) -> dict[str, Any]:
+    """Test common parameter combinations concurrently.
+
+    Results are printed as each combination finishes. Requests back off on
+    429s exactly like the single-parameter sweep (``_infer_with_retry``); once
+    MAX_CONSECUTIVE_RATE_LIMITS combinations in a row have still ended rate
+    limited, the ones not yet sent are skipped and reported as "cancelled".
+    """
     print("\n🔬 Testing parameter combinations...")
 
     combinations = [
@@ -130,26 +390,136 @@ def test_parameter_combinations(provider: AzureOpenAILanguageModel) -> dict[str,
         },
     ]
 
-    results = {}
     test_prompt = (
         'Respond with: {"message": "Hello from Azure OpenAI", "status": "success"}'
     )
-
-    for combo in combinations:
-        print(f"  Testing: {combo['name']}")
-        try:
-            result_list = list(provider.infer([test_prompt], **combo['params']))
-            if result_list and result_list[0] and result_list[0][0].output:
-                results[combo['name']] = {
-                    "status": "success",
-                    "response_preview": result_list[0][0].output[:100],
+    # Far fewer slots than combinations, so some are still unsent when the
+    # rate-limit breaker trips and can actually be skipped.
+    semaphore = asyncio.Semaphore(min(MAX_CONCURRENCY, COMBINATION_CONCURRENCY))
+    breaker = {"consecutive_rate_limits": 0}
+
+    async def run_combo(combo: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        async with semaphore:
+            # Checked before sending: a request already in a worker thread
+            # cannot be recalled, so only unsent ones are reported cancelled.
+            if breaker["consecutive_rate_limits"] >= MAX_CONSECUTIVE_RATE_LIMITS:
+                return combo['name'], {
+                    "status": "cancelled",
+                    "reason": "Not sent: repeatedly rate limited",
                 }
-            else:
-                results[combo['name']] = {"status": "no_response"}
-        except Exception as e:
-            results[combo['name']] = {"status": "error", "error": str(e)}
+            try:
+                result_list = await asyncio.to_thread(
+                    _infer_with_retry, provider, [test_prompt], **combo['params']
+                )
+            except Exception as e:
+                if _is_rate_limited(e):
+                    breaker["consecutive_rate_limits"] += 1
+                else:
+                    breaker["consecutive_rate_limits"] = 0
+                return combo['name'], {"status": "error", "error": str(e)}
+            breaker["consecutive_rate_limits"] = 0
+        if result_list and result_list[0] and result_list[0][0].output:
+            return combo['name'], {
+                "status": "success",
+                "response_preview": result_list[0][0].output[:100],
+            }
+        return combo['name'], {"status": "no_response"}
+
+    results: dict[str, Any] = {}
+    markers = {"success": "✅", "cancelled": "⏭️ "}
+    for next_done in asyncio.as_completed([run_combo(c) for c in combinations]):
+        name, result = await next_done
+        results[name] = result
+        print(f"  {markers.get(result['status'], '❌')} {name}")
+
+    # Report in declaration order
+    return {combo['name']: results[combo['name']] for combo in combinations}
+
+
+def _flatten(parameters: dict[str, list[Any]]) -> list[Any]:
+    """One pytest param per (name, value), grouped by name for pytest-xdist."""
+    # The xdist_group marker only exists with pytest-xdist installed, and
+    # --strict-markers rejects it otherwise.
+    has_xdist = importlib.util.find_spec("xdist") is not None
+    return [
+        pytest.param(
+            param_name,
+            value,
+            id=f"{param_name}-{value}",
+            marks=[pytest.mark.xdist_group(name=param_name)] if has_xdist else [],
+        )
+        for param_name, values in parameters.items()
+        for value in values
+    ]
+
 
-    return results
+def build_provider(
+    api_key: str, endpoint: str, version: str, http_client: httpx.Client
+) -> AzureOpenAILanguageModel:
+    """Sweep provider on a caller-owned HTTP client, with SDK retries off."""
+    return AzureOpenAILanguageModel(
+        model_id="azureopenai-test",
+        api_key=api_key,
+        azure_endpoint=endpoint,
+        api_version=version,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+@pytest.fixture(scope="session")
+def azure_http_client() -> Iterator[httpx.Client]:
+    """One HTTP client (and connection pool) for every provider in the session."""
+    with build_http_client() as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def azure_provider(azure_http_client) -> Iterator[AzureOpenAILanguageModel]:
+    """Provider for the real Azure OpenAI API; skips without credentials."""
+    api_key = os.getenv("AZURE_OPENAI_API_KEY")
+    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    version = os.getenv("AZURE_OPENAI_API_VERSION")
+    if not api_key or not endpoint or not version:
+        pytest.skip(
+            "Set AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT and "
+            "AZURE_OPENAI_API_VERSION to run Azure parameter tests"
+        )
+
+    provider = build_provider(api_key, endpoint, version, azure_http_client)
+    if CACHE_PATH:
+        cached = CachedProvider(provider, CACHE_PATH)
+        yield cached
+        cached.save()
+    else:
+        yield provider
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("param_name,value", _flatten(TEST_PARAMETERS))
+def test_param(param_name: str, value: Any, azure_provider) -> None:
+    """Each swept value is accepted by Azure, or rejected locally if unsupported."""
+    result = check_parameter(param_name, value, azure_provider)
+    if param_name in _UNSUPPORTED_CONFIG_KEYS:
+        assert result['status'] == 'error', result
+    else:
+        assert result['status'] in ('success', 'skipped'), result
+
+
+def write_report(path: str, report: dict[str, Any]) -> None:
+    """Write the results report as indented JSON, via orjson when installed."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    report,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    default=str,
+                )
+            )
+        return
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
 
 
 def main():
@@ -168,79 +538,75 @@ def main():
         print("  export AZURE_OPENAI_API_VERSION='2024-12-01-preview'")
         sys.exit(1)
 
-    # Create provider
+    # Create provider. Everything below, combinations included, goes through
+    # this one provider and therefore one HTTP client and connection pool.
+    http_client = build_http_client()
     try:
-        provider = AzureOpenAILanguageModel(
-            model_id="azureopenai-test",
-            api_key=api_key,
-            azure_endpoint=endpoint,
-            api_version=version,
-        )
+        provider = build_provider(api_key, endpoint, version, http_client)
         print("✅ Provider created successfully")
         print(f"   Deployment: {provider.deployment_name}")
     except Exception as e:
         print(f"❌ Failed to create provider: {e}")
         sys.exit(1)
 
-    # Test results storage
-    test_results = {}
+    if CACHE_PATH:
+        provider = CachedProvider(provider, CACHE_PATH)
+        print(f"   Response cache: {CACHE_PATH}")
 
     # Test each parameter
     print("\n🔍 Testing individual parameters...")
+    print(f"   (up to {MAX_CONCURRENCY} concurrent requests)")
     print("-" * 40)
 
-    for param_name, test_values in TEST_PARAMETERS.items():
-        print(f"\n📋 Testing parameter: {param_name}")
-        param_results = {}
+    test_results = asyncio.run(run_parameter_sweep(provider))
 
-        for value in test_values:
-            result = test_parameter(param_name, value, provider)
-            param_results[str(value)] = result
+    lines: list[str] = []
+    for param_name, param_results in test_results.items():
+        lines.append(f"\n📋 Results for parameter: {param_name}")
 
+        for value, result in param_results:
             # Print result summary
             status = result['status']
             if status == 'success':
-                print(f"    ✅ {value}: Success")
+                lines.append(f"    ✅ {value}: Success")
             elif status == 'skipped':
-                print(f"    ⏭️  {value}: Skipped - {result['reason']}")
+                lines.append(f"    ⏭️  {value}: Skipped - {result['reason']}")
             elif status == 'invalid_parameter':
-                print(f"    ❌ {value}: Invalid parameter - {result['error']}")
+                lines.append(f"    ❌ {value}: Invalid parameter - {result['error']}")
             elif status == 'api_error':
-                print(f"    🔥 {value}: API Error - {result['error']}")
+                lines.append(f"    🔥 {value}: API Error - {result['error']}")
+            elif status == 'error':
+                lines.append(f"    ⚠️  {value}: Error - {result['error']}")
             else:
-                print(f"    ⚠️  {value}: {status}")
-
-        test_results[param_name] = param_results
+                lines.append(f"    ⚠️  {value}: {status}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
     # Test parameter combinations
-    combo_results = test_parameter_combinations(provider)
-    test_results['combinations'] = combo_results
+    combo_results = asyncio.run(check_parameter_combinations(provider))
 
     # Summary
     print("\n📊 Test Summary")
     print("=" * 60)
 
-    total_tests = 0
-    successful_tests = 0
-
-    for param_name, results in test_results.items():
-        if param_name == 'combinations':
-            continue
-
-        param_success = sum(1 for r in results.values() if r['status'] == 'success')
-        param_total = len(results)
-        total_tests += param_total
-        successful_tests += param_success
-
-        print(f"{param_name:20}: {param_success}/{param_total} passed")
-
-    # Combination results
-    combo_success = sum(1 for r in combo_results.values() if r['status'] == 'success')
-    combo_total = len(combo_results)
-    print(f"{'combinations':20}: {combo_success}/{combo_total} passed")
+    status_counts = {
+        param_name: Counter(r['status'] for _, r in results)
+        for param_name, results in test_results.items()
+    }
+    summary = {
+        param_name: (status_counts[param_name]['success'], len(results))
+        for param_name, results in test_results.items()
+    }
+    summary['combinations'] = (
+        Counter(r['status'] for r in combo_results.values())['success'],
+        len(combo_results),
+    )
+    lines = [f"{k:20}: {ok}/{n} passed" for k, (ok, n) in summary.items()]
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
-    total_tests += combo_total
-    successful_tests += combo_success
+    successful_tests = sum(ok for ok, _ in summary.values())
+    total_tests = sum(n for _, n in summary.values())
 
     success_rate = (successful_tests / total_tests) * 100 if total_tests > 0 else 0
     print(
@@ -248,18 +614,24 @@ def main():
     )
 
     # Save detailed results
-    with open("azure_parameter_test_results.json", "w") as f:
-        json.dump(test_results, f, indent=2, default=str)
+    report: dict[str, dict[str, Any]] = {
+        param_name: {str(value): result for value, result in results}
+        for param_name, results in test_results.items()
+    }
+    report['combinations'] = combo_results
+    write_report("azure_parameter_test_results.json", report)
     print("\n💾 Detailed results saved to: azure_parameter_test_results.json")
 
+    if isinstance(provider, CachedProvider):
+        provider.save()
+
     # Recommendations
     print("\n💡 Recommendations:")
-    failed_params = []
-    for param_name, results in test_results.items():
-        if param_name == 'combinations':
-            continue
-        if not any(r['status'] == 'success' for r in results.values()):
-            failed_params.append(param_name)
+    failed_params = [
+        param_name
+        for param_name, counts in status_counts.items()
+        if not counts['success']
+    ]
 
     if failed_params:
         print(
@@ -270,6 +642,7 @@ def main():
     else:
         print("   ✅ All parameters appear to be valid!")
 
+    http_client.close()
     print("\n🏁 Test completed!")
 
 
@@ -14,11 +14,20 @@ import langextract as lx
 import pytest
 
 from langextract_azureopenai import AzureOpenAILanguageModel
-from langextract_azureopenai.provider import _AZURE_OPENAI_CONFIG_KEYS
+from langextract_azureopenai.provider import (
+    _AZURE_OPENAI_CONFIG_KEYS,
+    _UNSUPPORTED_CONFIG_KEYS,
+)
 
 
 @pytest.mark.unit
-def test_parameter_filtering():
+def test_config_keys_is_frozenset():
+    """The whitelist is an immutable set, so filtering is O(1) per key."""
+    assert isinstance(_AZURE_OPENAI_CONFIG_KEYS, frozenset)
+
+
+@pytest.mark.unit
+def test_parameter_filtering(mock_completion_response):
     """Valid params are kept, invalid are dropped; API call receives only allowed values."""
     test_kwargs = {
         # Valid parameters (should be kept)
@@ -73,14 +82,11 @@ def test_parameter_filtering():
                 'internal_langextract_param',
             }
 
-            assert expected_valid.issubset(stored_params.keys())
-            assert not expected_invalid.intersection(stored_params.keys())
+            assert stored_params.keys() >= expected_valid
+            assert not stored_params.keys() & expected_invalid
 
             # Mock the API response
-            mock_response = MagicMock()
-            mock_response.choices = [MagicMock()]
-            mock_response.choices[0].message.content = "Test response"
-            mock_client.chat.completions.create.return_value = mock_response
+            mock_client.chat.completions.create.return_value = mock_completion_response
 
             runtime_kwargs = {
                 'temperature': 0.9,  # override
@@ -88,7 +94,7 @@ def test_parameter_filtering():
                 'invalid_runtime': 'should_be_filtered',
             }
             results = list(provider.infer(["Test prompt"], **runtime_kwargs))
-            assert results and results[0][0].output == "Test response"
+            assert results and results[0][0].output == "Mock response content"
 
             api_params = mock_client.chat.completions.create.call_args[1]
             assert api_params['temperature'] == 0.9
@@ -128,12 +134,7 @@ def test_individual_parameters_supported_vs_unsupported():
         with patch('openai.AzureOpenAI'):
             for param_name in sorted(_AZURE_OPENAI_CONFIG_KEYS):
                 val = test_values.get(param_name, 'x')
-                if param_name in {
-                    'stream',
-                    'tools',
-                    'tool_choice',
-                    'parallel_tool_calls',
-                }:
+                if param_name in _UNSUPPORTED_CONFIG_KEYS:
                     with pytest.raises(lx.exceptions.InferenceConfigError):
                         AzureOpenAILanguageModel(
                             model_id="azureopenai-test", **{param_name: val}
@@ -55,15 +55,31 @@ def main():
 
     print(f"✓ Created {model.__class__.__name__}")
 
-    # Test inference
-    prompts = ["Say hello"]
-    results = list(model.infer(prompts))
+    # Test inference. The smoke test only prints the first 50 characters, so
+    # stream the completion through the plugin and stop reading once that much
+    # has arrived instead of waiting for the full response.
+    preview = stream_preview(model, "Say hello", limit=50)
 
-    if results and results[0]:
-        print(f"✓ Inference worked: {results[0][0].output[:50]}...")
+    if preview:
+        print(f"✓ Inference worked: {preview}...")
     else:
         print("✗ No response")
 
 
+def stream_preview(model, prompt: str, limit: int) -> str:
+    """Return the first `limit` characters of a streamed completion."""
+    chunks = model.infer_stream(prompt)
+    buf = ""
+    try:
+        for text in chunks:
+            buf += text
+            if len(buf) >= limit:
+                break
+    finally:
+        # Closes the HTTP stream instead of draining the rest of the response
+        chunks.close()
+    return buf[:limit]
+
+
 if __name__ == "__main__":
     main()
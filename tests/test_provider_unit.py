@@ -1,5 +1,8 @@
 """Unit tests for Azure OpenAI provider."""
 
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
 import langextract as lx
 import pytest
 
@@ -11,37 +14,59 @@ from langextract_azureopenai.schema import AzureOpenAISchema
 class TestAzureOpenAIProvider:
     """Test Azure OpenAI provider functionality."""
 
-    def test_provider_initialization(self, mock_azure_credentials, mock_openai_client):
+    def test_provider_initialization(self, provider):
         """Test provider can be initialized with valid credentials."""
-        provider = AzureOpenAILanguageModel(
-            model_id="azureopenai-gpt-4",
-            api_key="test-key",
-            azure_endpoint="https://test.openai.azure.com/",
-        )
-
         assert provider.model_id == "azureopenai-gpt-4"
         assert provider.deployment_name == "gpt-4"
         assert provider.api_key == "test-key"
         assert provider.azure_endpoint == "https://test.openai.azure.com/"
 
-    def test_deployment_name_extraction(
-        self, mock_azure_credentials, mock_openai_client
-    ):
-        """Test deployment name is correctly extracted from model ID."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "model_id,expected_deployment",
+        [
             ("azureopenai-gpt-4", "gpt-4"),
             ("azureopenai-gpt-35-turbo", "gpt-35-turbo"),
             ("azureopenai-custom-model", "custom-model"),
             ("direct-deployment", "direct-deployment"),  # No prefix
-        ]
+        ],
+    )
+    def test_deployment_name_extraction(self, model_id, expected_deployment):
+        """Test deployment name is correctly extracted from model ID."""
+        assert (
+            AzureOpenAILanguageModel._derive_deployment_name(model_id)
+            == expected_deployment
+        )
+
+    def test_http_client_passed_to_sdk(self, mock_azure_credentials):
+        """A caller-supplied HTTP client is handed to openai.AzureOpenAI."""
+        http_client = object()
+        with patch('openai.AzureOpenAI') as mock_client_class:
+            AzureOpenAILanguageModel(
+                model_id="azureopenai-gpt-4",
+                api_key="test-key",
+                azure_endpoint="https://test.openai.azure.com/",
+                http_client=http_client,
+            )
+
+        assert mock_client_class.call_args.kwargs['http_client'] is http_client
+
+    def test_max_retries_passed_to_sdk(self, mock_azure_credentials):
+        """max_retries is forwarded only when set, keeping the SDK default."""
+        with patch('openai.AzureOpenAI') as mock_client_class:
+            AzureOpenAILanguageModel(
+                model_id="azureopenai-gpt-4",
+                api_key="test-key",
+                azure_endpoint="https://test.openai.azure.com/",
+            )
+            assert 'max_retries' not in mock_client_class.call_args.kwargs
 
-        for model_id, expected_deployment in test_cases:
-            provider = AzureOpenAILanguageModel(
-                model_id=model_id,
+            AzureOpenAILanguageModel(
+                model_id="azureopenai-gpt-4",
                 api_key="test-key",
                 azure_endpoint="https://test.openai.azure.com/",
+                max_retries=0,
             )
-            assert provider.deployment_name == expected_deployment
+            assert mock_client_class.call_args.kwargs['max_retries'] == 0
 
     def test_parameter_filtering(self, mock_azure_credentials, mock_openai_client):
         """Test that parameter filtering works correctly."""
@@ -97,14 +122,9 @@ class TestAzureOpenAIProvider:
         # When schema is applied, provider should enable structured output mode
         assert getattr(provider, '_enable_structured_output', False) is True
 
-    def test_inference_basic(self, mock_azure_credentials, mock_openai_client):
+    def test_inference_basic(self, provider, class_openai_client):
         """Test basic inference functionality."""
-        provider = AzureOpenAILanguageModel(
-            model_id="azureopenai-gpt-4",
-            api_key="test-key",
-            azure_endpoint="https://test.openai.azure.com/",
-        )
-
+        class_openai_client.reset_mock()
         prompts = ["Test prompt"]
         results = list(provider.infer(prompts))
 
@@ -114,49 +134,97 @@ class TestAzureOpenAIProvider:
         assert results[0][0].score == 1.0
 
         # Verify API was called correctly
-        mock_openai_client.chat.completions.create.assert_called_once()
-        call_kwargs = mock_openai_client.chat.completions.create.call_args[1]
+        class_openai_client.chat.completions.create.assert_called_once()
+        call_kwargs = class_openai_client.chat.completions.create.call_args[1]
         assert call_kwargs['model'] == 'gpt-4'  # deployment name
         assert call_kwargs['messages'] == [{'role': 'user', 'content': 'Test prompt'}]
 
-    def test_inference_with_parameters(
+    def test_build_request_with_parameters(self, provider):
+        """Generation params are mapped onto the API request."""
+        request = provider._build_request(
+            "Test prompt",
+            temperature=0.7,
+            top_p=0.9,
+            frequency_penalty=0.1,
+            presence_penalty=0.1,
+            max_completion_tokens=100,
+            invalid_param="dropped",
+        )
+
+        assert request == {
+            'model': 'gpt-4',
+            'messages': [{'role': 'user', 'content': 'Test prompt'}],
+            'temperature': 0.7,
+            'top_p': 0.9,
+            'frequency_penalty': 0.1,
+            'presence_penalty': 0.1,
+            'max_completion_tokens': 100,
+        }
+
+    def test_build_request_uses_stored_kwargs(
         self, mock_azure_credentials, mock_openai_client
     ):
-        """Test inference with various parameters."""
+        """Constructor kwargs apply unless overridden for the call."""
         provider = AzureOpenAILanguageModel(
             model_id="azureopenai-gpt-4",
             api_key="test-key",
             azure_endpoint="https://test.openai.azure.com/",
+            seed=1,
+            user="stored-user",
         )
 
-        prompts = ["Test prompt"]
-        results = list(
-            provider.infer(
-                prompts,
-                temperature=0.7,
-                top_p=0.9,
-                frequency_penalty=0.1,
-                presence_penalty=0.1,
-                max_completion_tokens=100,
+        request = provider._build_request("Test prompt", seed=2)
+
+        assert request['seed'] == 2
+        assert request['user'] == "stored-user"
+
+    def test_infer_stream(self, mock_azure_credentials, mock_openai_client):
+        """infer_stream sends the built request with stream=True and yields text."""
+        chunks = [
+            SimpleNamespace(
+                choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]
             )
+            for text in ("Hel", None, "lo")
+        ]
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(chunks)
+        mock_openai_client.chat.completions.create.return_value = stream
+        provider = AzureOpenAILanguageModel(
+            model_id="azureopenai-gpt-4",
+            api_key="test-key",
+            azure_endpoint="https://test.openai.azure.com/",
         )
 
-        assert len(results) == 1
+        assert list(provider.infer_stream("Test prompt", top_p=0.5)) == ["Hel", "lo"]
 
-        # Check that parameters were passed to API
-        call_kwargs = mock_openai_client.chat.completions.create.call_args[1]
-        assert call_kwargs['temperature'] == 0.7
-        assert call_kwargs['top_p'] == 0.9
-        assert call_kwargs['frequency_penalty'] == 0.1
-        assert call_kwargs['presence_penalty'] == 0.1
-        assert call_kwargs['max_completion_tokens'] == 100
+        call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+        assert call_kwargs == {
+            **provider._build_request("Test prompt", top_p=0.5),
+            'stream': True,
+        }
+        stream.close.assert_called_once()
 
-    def test_unsupported_parameters_raise(
+    def test_infer_stream_wraps_api_errors(
         self, mock_azure_credentials, mock_openai_client
     ):
+        """SDK errors surface as InferenceRuntimeError, like infer()."""
+        mock_openai_client.chat.completions.create.side_effect = ValueError("boom")
+        provider = AzureOpenAILanguageModel(
+            model_id="azureopenai-gpt-4",
+            api_key="test-key",
+            azure_endpoint="https://test.openai.azure.com/",
+        )
+
+        with pytest.raises(lx.exceptions.InferenceRuntimeError, match="boom"):
+            list(provider.infer_stream("Test prompt"))
+
+    def test_unsupported_parameters_raise(self, provider):
         """Unsupported parameters should raise InferenceConfigError."""
-        # Unsupported at construction
-        with pytest.raises(lx.exceptions.InferenceConfigError):
+        # Unsupported at construction. The API version comes from the
+        # credentials env patched by the class-scoped `provider` fixture.
+        with pytest.raises(
+            lx.exceptions.InferenceConfigError, match="Unsupported parameter"
+        ):
             AzureOpenAILanguageModel(
                 model_id="azureopenai-gpt-4",
                 api_key="test-key",
@@ -165,19 +233,12 @@ class TestAzureOpenAIProvider:
             )
 
         # Unsupported at inference time
-        provider = AzureOpenAILanguageModel(
-            model_id="azureopenai-gpt-4",
-            api_key="test-key",
-            azure_endpoint="https://test.openai.azure.com/",
-        )
         with pytest.raises(lx.exceptions.InferenceConfigError):
             list(provider.infer(["hello"], stream=True))
 
     def test_missing_credentials_error(self):
         """Test that missing credentials raise appropriate errors."""
         # Ensure env does not accidentally satisfy credentials for this test
-        from unittest.mock import patch
-
         with patch.dict(
             'os.environ',
             {
@@ -21,10 +21,11 @@ def test_import_provider():
 
 @pytest.mark.unit
 def test_provider_registration():
-    """Provider registration and routing via registry.resolve()."""
-    import langextract as lx
+    """Provider registration and routing via registry.resolve().
+
+    Plugins are loaded once per session by the `_load_plugins` fixture.
+    """
     from langextract.providers import registry
 
-    lx.providers.load_plugins_once()
     provider_class = registry.resolve('azureopenai-test')
     assert provider_class.__name__ == 'AzureOpenAILanguageModel'